@@ -0,0 +1,105 @@
+# Content-addressed cache for LLM responses
+# -------------------------------------------------
+# Keys are a BLAKE2b digest of the prompt messages plus model and temperature,
+# so identical calls (reruns, re-opened tabs, repeated clicks) skip Groq entirely.
+# The store is shared by all sessions of the Streamlit server process.
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterator, List, Optional, Tuple
+
+import streamlit as st
+
+TTL_SECONDS = 3600
+MAX_ENTRIES = 512
+
+
+def prompt_key(messages: List, model: str, temperature: float) -> str:
+    payload = json.dumps(
+        [[m.type, m.content] for m in messages] + [model, temperature],
+        sort_keys=True,
+    )
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@st.cache_resource(show_spinner=False)
+def _store() -> Tuple[OrderedDict, threading.Lock]:
+    # key -> (stored_at, content), oldest first
+    return OrderedDict(), threading.Lock()
+
+
+def get(key: str) -> Optional[str]:
+    entries, lock = _store()
+    with lock:
+        hit = entries.get(key)
+        if hit is None:
+            return None
+        stored_at, content = hit
+        if time.monotonic() - stored_at > TTL_SECONDS:
+            del entries[key]
+            return None
+        entries.move_to_end(key)
+        return content
+
+
+def put(key: str, content: str) -> None:
+    entries, lock = _store()
+    with lock:
+        entries[key] = (time.monotonic(), content)
+        entries.move_to_end(key)
+        while len(entries) > MAX_ENTRIES:
+            entries.popitem(last=False)
+
+
+def llm_key(llm, messages: List) -> str:
+    return prompt_key(messages, llm.model_name, llm.temperature)
+
+
+async def cached_ainvoke(llm, messages: List, use_cache: bool = True) -> str:
+    """
+    Return the cached response for these messages, calling the LLM only on a miss.
+    use_cache=False always calls the LLM (and stores the fresh response).
+    """
+    key = llm_key(llm, messages)
+    content = get(key) if use_cache else None
+    if content is None:
+        content = (await llm.ainvoke(messages)).content
+        put(key, content)
+    return content
+
+
+def cached_stream(llm, messages: List, use_cache: bool = True) -> Iterator[str]:
+    """Yield the response as it streams in; a cache hit is yielded in one piece.
+
+    The full text is only cached once the stream completes, so an interrupted
+    rerun never stores a truncated response. use_cache=False skips the lookup.
+    """
+    key = llm_key(llm, messages)
+    content = get(key) if use_cache else None
+    if content is not None:
+        yield content
+        return
+    parts = []
+    for chunk in llm.stream(messages):
+        parts.append(chunk.content)
+        yield chunk.content
+    put(key, "".join(parts))
+
+
+async def cached_abatch(llm, messages_list: List[List], max_concurrency: int) -> List[str]:
+    """Like cached_ainvoke for several prompts: only the misses go out, as one llm.abatch."""
+    keys = [llm_key(llm, messages) for messages in messages_list]
+    results = [get(key) for key in keys]
+    misses = [i for i, content in enumerate(results) if content is None]
+    if misses:
+        replies = await llm.abatch(
+            [messages_list[i] for i in misses],
+            config={"max_concurrency": max_concurrency},
+        )
+        for i, reply in zip(misses, replies):
+            results[i] = reply.content
+            put(keys[i], reply.content)
+    return results
@@ -0,0 +1,22 @@
+# Supervisor sign-off parsing
+# -------------------------------------------------
+# The supervisor is told to answer "APPROVED" when a draft needs no changes.
+# Only that sign-off counts: substrings such as "not approved" or "UNAPPROVED"
+# must not.
+
+import re
+from typing import List
+
+# The notes open with the sign-off ("APPROVED", "**Approved.**", "APPROVED - reads well") ...
+_LEADING_SIGN_OFF = re.compile(r"^[\s*_#>`\"'-]*APPROVED\b", re.IGNORECASE)
+# ... or one line holds nothing but it.
+_SIGN_OFF_LINE = re.compile(r"^[\W_]*APPROVED[\W_]*$", re.IGNORECASE | re.MULTILINE)
+
+
+def is_approved(notes: str) -> bool:
+    return bool(_LEADING_SIGN_OFF.match(notes) or _SIGN_OFF_LINE.search(notes))
+
+
+def best_candidate(notes: List[str]) -> int:
+    """Index of the candidate to keep: an approved one first, then the fewest notes."""
+    return min(range(len(notes)), key=lambda i: (not is_approved(notes[i]), len(notes[i])))
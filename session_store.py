@@ -0,0 +1,76 @@
+# Disk-backed mirror of the pipeline state
+# -------------------------------------------------
+# st.session_state lives in server RAM and is lost on reconnect, tab reload or
+# restart. Each session's state dict is mirrored into a diskcache under an id
+# kept in the page URL (?sid=), so a reload picks up where it left off without
+# regenerating anything.
+#
+# Privacy: the ?sid= link is a bearer token. Anyone given the URL can load a
+# copy of that draft, so don't share it. They can't overwrite it, though: the
+# URL id is only read to restore from, and every browser session then saves
+# under a fresh id of its own, so shared links and duplicate tabs fork instead
+# of clobbering each other. Entries expire after SESSION_TTL.
+
+import uuid
+from typing import Dict
+
+import diskcache
+import streamlit as st
+import zstandard
+
+CACHE_DIR = "./.sess_cache"
+SIZE_LIMIT = 500_000_000
+SESSION_TTL = 7 * 24 * 3600
+
+
+@st.cache_resource(show_spinner=False)
+def _cache() -> diskcache.Cache:
+    return diskcache.Cache(CACHE_DIR, size_limit=SIZE_LIMIT)
+
+
+def _key(sid: str) -> str:
+    return f"blogger:state:{sid}"
+
+
+def session_id() -> str:
+    # Fresh per browser session and pinned in session_state; Streamlit's own
+    # runtime session id can't be used because it doesn't survive a reload.
+    if "sid" not in st.session_state:
+        st.session_state.sid = uuid.uuid4().hex
+        st.query_params["sid"] = st.session_state.sid
+    return st.session_state.sid
+
+
+def load_state() -> Dict:
+    # Read the id the page was opened with before session_id() replaces it.
+    opened_with = st.query_params.get("sid")
+    state = _cache().get(_key(opened_with), {}) if opened_with else {}
+    session_id()
+    if state:
+        # Store the restored copy under this session's id right away; the URL
+        # now points there, so a second reload before any edit still finds it.
+        save_state(state)
+    return state
+
+
+def save_state(state: Dict) -> None:
+    _cache().set(_key(session_id()), state, expire=SESSION_TTL)
+
+
+class CompressedStr:
+    """
+    Long text kept zstd-compressed in session state (and on disk); str() decodes
+    on demand. Drafts, outlines and notes shrink several-fold, which adds up
+    across many concurrent sessions.
+    """
+    __slots__ = ("blob", "length")
+
+    def __init__(self, text: str):
+        self.blob = zstandard.ZstdCompressor(level=3).compress(text.encode("utf-8"))
+        self.length = len(text)
+
+    def __str__(self) -> str:
+        return zstandard.ZstdDecompressor().decompress(self.blob).decode("utf-8")
+
+    def __len__(self) -> int:
+        return self.length
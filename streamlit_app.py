@@ -9,18 +9,26 @@
 # Inspired by your original notebook/script.
 
 
+import io
 import os
 import json
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 import streamlit as st
-from typing import List, Dict
-from langchain_groq import ChatGroq
-from langchain.schema import SystemMessage, HumanMessage
+from json_repair import repair_json
+from typing import Iterable, List, Dict, Tuple
+from llm_cache import cached_abatch, cached_ainvoke, cached_stream
+from session_store import CompressedStr, load_state, save_state
+from review import best_candidate
 
 # -------------------------------
 # Minimal markdown → PDF builder
 # -------------------------------
+_PDF_ESC = str.maketrans({"\\": "\\\\", "(": "\\(", ")": "\\)"})
+
 def _escape_pdf_text(s: str) -> str:
-    return s.replace("\\\\", "\\\\\\\\").replace("(", "\\\\(").replace(")", "\\\\)")
+    return s.translate(_PDF_ESC)
 
 def markdown_to_basic_pdf_bytes(md_text: str) -> bytes:
     """
@@ -41,22 +49,13 @@ def markdown_to_basic_pdf_bytes(md_text: str) -> bytes:
     start_x = 54
     start_y = height - 54
 
-    # Compose content stream
-    content_lines = [
-        "BT",
-        f"/F1 {font_size} Tf",
-        f"{start_x} {start_y} Td",
-        f"{leading} TL",
-    ]
-    for i, line in enumerate(lines):
-        esc = _escape_pdf_text(line)
-        if i == 0:
-            content_lines.append(f"({_escape_pdf_text(esc)}) Tj")
-        else:
-            content_lines.append("T*")
-            content_lines.append(f"({_escape_pdf_text(esc)}) Tj")
-    content_lines.append("ET")
-    content = "\n".join(content_lines).encode("utf-8")
+    # Compose content stream: escape the whole text once, then turn each line
+    # break into the Tj/T* operators between lines.
+    buf = io.BytesIO()
+    buf.write(f"BT\n/F1 {font_size} Tf\n{start_x} {start_y} Td\n{leading} TL\n(".encode("utf-8"))
+    buf.write(_escape_pdf_text("\n".join(lines)).encode("utf-8").replace(b"\n", b") Tj\nT*\n("))
+    buf.write(b") Tj\nET")
+    content = buf.getvalue()
     stream_obj = f"<< /Length {len(content)} >>\nstream\n".encode("utf-8") + content + b"\nendstream\n"
 
     # PDF objects
@@ -74,70 +73,131 @@ def markdown_to_basic_pdf_bytes(md_text: str) -> bytes:
     objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Name /F1 >>")
 
     # Assemble xref table
+    buf = io.BytesIO()
+    buf.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
     offsets = []
-    pdf = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
     for i, obj in enumerate(objects, start=1):
-        offsets.append(len(pdf))
-        pdf += f"{i} 0 obj\n".encode("utf-8") + obj + b"endobj\n"
-    xref_start = len(pdf)
-    pdf += f"xref\n0 {len(objects)+1}\n".encode("utf-8")
-    pdf += b"0000000000 65535 f \n"
+        offsets.append(buf.tell())
+        buf.write(f"{i} 0 obj\n".encode("utf-8"))
+        buf.write(obj)
+        buf.write(b"endobj\n")
+    xref_start = buf.tell()
+    buf.write(f"xref\n0 {len(objects)+1}\n".encode("utf-8"))
+    buf.write(b"0000000000 65535 f \n")
     for off in offsets:
-        pdf += f"{off:010d} 00000 n \n".encode("utf-8")
+        buf.write(f"{off:010d} 00000 n \n".encode("utf-8"))
     # trailer
-    pdf += b"trailer\n"
-    pdf += f"<< /Size {len(objects)+1} /Root 1 0 R >>\n".encode("utf-8")
-    pdf += b"startxref\n"
-    pdf += f"{xref_start}\n".encode("utf-8")
-    pdf += b"%%EOF"
-    return bytes(pdf)
+    buf.write(b"trailer\n")
+    buf.write(f"<< /Size {len(objects)+1} /Root 1 0 R >>\n".encode("utf-8"))
+    buf.write(b"startxref\n")
+    buf.write(f"{xref_start}\n".encode("utf-8"))
+    buf.write(b"%%EOF")
+    return buf.getvalue()
+
+@st.cache_resource(show_spinner=False)
+def _pdf_pool() -> ThreadPoolExecutor:
+    # Builds run off the script thread so the UI stays responsive for large uploads.
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="pdf")
 
 
 # -------------------------------
 # LLM helpers
 # -------------------------------
+# LangChain, langchain_groq and httpx are imported inside the functions that
+# need them, so a PDF-only session never pays for loading the LLM stack.
+#
+# System prompts are module constants so every call sends a byte-identical
+# prefix that Groq can serve from its prompt cache; anything that varies per
+# call (including revision notes and the previous draft) goes in the user turn.
+IDEAS_SYS = "You are an idea researcher. Provide concise idea bullets and 6-10 SEO keywords."
+ANGLES_SYS = "You are a content strategist. Suggest 3-5 distinct angles with a working title each, one per line."
+OUTLINE_SYS = "You are an expert outliner. Use markdown H2/H3; include intro & conclusion."
+WRITER_SYS = "You are a blog writer. Produce a cohesive draft with headings, TL;DR, and clear paragraphs."
+SUPERVISOR_SYS = "You are a strict supervisor. Give 3–6 concrete improvement notes if needed; else say APPROVED."
+FINALIZER_SYS = (
+    "You are a content ops specialist. Return strict JSON with keys: "
+    "title (<=60 chars), meta (<=160 chars), slug, tags (list of 3-5), body_md (final markdown). "
+    "Keep the user's tone."
+)
+
+@st.cache_resource(show_spinner=False, max_entries=16, ttl=3600)
 def make_llm(api_key: str, model: str = "llama-3.1-8b-instant", temperature: float = 0.4):
+    # Cached per (api_key, model, temperature) so reruns reuse the client and its
+    # keep-alive connection pool instead of re-handshaking on every click. Bounded
+    # so every key/temperature combination doesn't pin a client for the process life.
     if not api_key:
         raise ValueError("Please provide a GROQ API key in the sidebar.")
-    return ChatGroq(model=model, api_key=api_key, temperature=temperature)
-
-def ideas_researcher(llm, topic: str, audience: str, tone: str) -> Dict:
-    sys = SystemMessage(content="You are an idea researcher. Provide concise idea bullets and 6-10 SEO keywords.")
-    usr = HumanMessage(content=f"Topic: {topic}\nAudience: {audience}\nTone: {tone}")
-    ideas = llm.invoke([sys, usr]).content
+    import httpx
+    from langchain_groq import ChatGroq
+    limits = httpx.Limits(max_keepalive_connections=8)
+    return ChatGroq(
+        model=model,
+        api_key=api_key,
+        temperature=temperature,
+        http_client=httpx.Client(http2=True, limits=limits),
+        http_async_client=httpx.AsyncClient(http2=True, limits=limits),
+    )
+
+def chat_messages(system: str, user: str) -> List:
+    from langchain.schema import SystemMessage, HumanMessage
+    return [SystemMessage(content=system), HumanMessage(content=user)]
+
+@st.cache_resource(show_spinner=False)
+def _event_loop() -> asyncio.AbstractEventLoop:
+    # One long-lived loop in a daemon thread. The cached client's async pool is
+    # bound to the loop it first ran on, so a fresh asyncio.run() per click won't do.
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="llm-loop", daemon=True).start()
+    return loop
+
+def run_async(coro):
+    """Run a coroutine on the shared LLM loop and block the script until it's done."""
+    return asyncio.run_coroutine_threadsafe(coro, _event_loop()).result()
+
+async def ideas_researcher(llm, topic: str, audience: str, tone: str, use_cache: bool = True) -> Dict:
+    usr = f"Topic: {topic}\nAudience: {audience}\nTone: {tone}"
+    ideas = await cached_ainvoke(llm, chat_messages(IDEAS_SYS, usr), use_cache=use_cache)
     return {"ideas": ideas}
 
-def outliner(llm, ideas: str, keywords: List[str] | None = None) -> str:
+async def angle_brainstorm(llm, topic: str, audience: str, tone: str, use_cache: bool = True) -> str:
+    usr = f"Topic: {topic}\nAudience: {audience}\nTone: {tone}"
+    return await cached_ainvoke(llm, chat_messages(ANGLES_SYS, usr), use_cache=use_cache)
+
+async def outliner(llm, ideas: str, keywords: List[str] | None = None, angles: str = "",
+                   use_cache: bool = True) -> str:
     kw_str = ", ".join(keywords or [])
-    sys = SystemMessage(content="You are an expert outliner. Use markdown H2/H3; include intro & conclusion.")
-    usr = HumanMessage(content=f"Ideas:\n{ideas}\nKeywords: {kw_str}")
-    outline = llm.invoke([sys, usr]).content
+    usr = f"Ideas:\n{ideas}\nAngles:\n{angles}\nKeywords: {kw_str}"
+    outline = await cached_ainvoke(llm, chat_messages(OUTLINE_SYS, usr), use_cache=use_cache)
     return outline
 
-def writer(llm, topic: str, audience: str, tone: str, target_words: int, outline: str, instructions: str = "") -> str:
-    sys = SystemMessage(content="You are a blog writer. Produce a cohesive draft with headings, TL;DR, and clear paragraphs.")
-    usr = HumanMessage(content=(
+def writer_messages(topic: str, audience: str, tone: str, target_words: int, outline: str,
+                    instructions: str = "", previous_draft: str = "", variant: str = "") -> List:
+    # Stable fields first and the per-candidate variant last, so revision calls
+    # share the longest possible prefix.
+    content = (
         f"Topic: {topic}\nAudience: {audience}\nTone: {tone}\n"
         f"Target words: {target_words}\nOutline:\n{outline}\n"
         f"Extra instructions: {instructions}"
-    ))
-    return llm.invoke([sys, usr]).content
-
-def supervisor(llm, draft: str) -> str:
-    sys = SystemMessage(content="You are a strict supervisor. Give 3–6 concrete improvement notes if needed; else say APPROVED.")
-    usr = HumanMessage(content=f"Evaluate this draft for quality, tone, structure, coherence:\n\n{draft}")
-    return llm.invoke([sys, usr]).content
-
-def finalizer(llm, draft: str, notes: str, tone: str) -> Dict:
-    sys = SystemMessage(content=(
-        "You are a content ops specialist. Return strict JSON with keys: "
-        "title (<=60 chars), meta (<=160 chars), slug, tags (list of 3-5), body_md (final markdown). "
-        "Keep the user's tone."
-    ))
-    usr = HumanMessage(content=f"Draft:\n{draft}\nNotes:\n{notes}\nTone: {tone}")
-    result = llm.invoke([sys, usr]).content
+    )
+    if previous_draft:
+        content += f"\nPrevious draft:\n{previous_draft}"
+    if variant:
+        content += f"\n{variant}"
+    return chat_messages(WRITER_SYS, content)
+
+def supervisor_messages(draft: str) -> List:
+    usr = f"Evaluate this draft for quality, tone, structure, coherence:\n\n{draft}"
+    return chat_messages(SUPERVISOR_SYS, usr)
+
+def finalizer_messages(draft: str, notes: str, tone: str) -> List:
+    usr = f"Draft:\n{draft}\nNotes:\n{notes}\nTone: {tone}"
+    return chat_messages(FINALIZER_SYS, usr)
+
+def parse_final_pack(result: str) -> Dict:
     try:
-        data = json.loads(result)
+        # Salvage near-valid output (code fences, stray prose, trailing commas)
+        # instead of falling back and forcing another LLM round trip.
+        data = json.loads(repair_json(result))
         # sanity
         if not all(k in data for k in ("title", "meta", "slug", "tags", "body_md")):
             raise ValueError("Missing keys in JSON.")
@@ -152,6 +212,157 @@ def finalizer(llm, draft: str, notes: str, tone: str) -> Dict:
             "body_md": result,
         }
 
+async def ideas_and_outline(llm, topic: str, audience: str, tone: str,
+                            use_cache: bool = True) -> Tuple[Dict, str, str]:
+    # Ideas and angles are independent, so they run concurrently; the outline needs both.
+    idea_pack, angles = await asyncio.gather(
+        ideas_researcher(llm, topic, audience, tone, use_cache=use_cache),
+        angle_brainstorm(llm, topic, audience, tone, use_cache=use_cache),
+    )
+    outline = await outliner(llm, idea_pack["ideas"], angles=angles, use_cache=use_cache)
+    return idea_pack, angles, outline
+
+REVISION_CANDIDATES = 3
+
+async def revise(llm, state: Dict, n: int = REVISION_CANDIDATES) -> Tuple[str, str]:
+    """Batch n candidate revisions, then batch their reviews; return the best (draft, notes)."""
+    extra = state["instructions"] + "\n\nRevise based on these notes:\n" + str(state["supervisor_notes"])
+    drafts = await cached_abatch(llm, [
+        writer_messages(state["topic"], state["audience"], state["tone"],
+                        int(state["target_words"]), str(state["outline"]),
+                        extra, previous_draft=str(state["draft"]),
+                        variant=f"Variant {k + 1} of {n}: take a distinct approach from the other variants.")
+        for k in range(n)
+    ], max_concurrency=n)
+    notes = await cached_abatch(llm, [supervisor_messages(d) for d in drafts], max_concurrency=n)
+    # Prefer an approved draft, then the one with the fewest remaining notes.
+    best = best_candidate(notes)
+    return drafts[best], notes[best]
+
+
+# -------------------------------
+# Streaming render
+# -------------------------------
+def _stable_cut(text: str) -> int:
+    """Index of the last blank-line block break that isn't inside a code fence, or -1."""
+    cut = text.rfind("\n\n")
+    while cut != -1 and text.count("```", 0, cut) % 2:
+        cut = text.rfind("\n\n", 0, cut)
+    return cut
+
+def stream_markdown(chunks: Iterable[str]) -> str:
+    """
+    Render streamed markdown and return the full text.
+    Completed blocks are written once as their own element; only the trailing,
+    still-growing block is re-rendered per chunk, so cost stays linear in length.
+    """
+    stable_area = st.container()
+    tail = st.empty()
+    parts: List[str] = []
+    trailing = ""
+    for chunk in chunks:
+        parts.append(chunk)
+        trailing += chunk
+        cut = _stable_cut(trailing)
+        if cut != -1:
+            stable_area.markdown(trailing[:cut])
+            trailing = trailing[cut + 2:]
+        tail.markdown(trailing)
+    return "".join(parts)
+
+
+# -------------------------------
+# Panels
+# -------------------------------
+def _settle_pdf_job(pdf_key: str):
+    """Swap a finished build's future for its bytes; a failed build is dropped and its error kept."""
+    job = st.session_state.get(pdf_key)
+    if isinstance(job, Future) and job.done():
+        try:
+            st.session_state[pdf_key] = job.result()
+        except Exception as e:
+            st.session_state.pop(pdf_key, None)
+            st.session_state.pdf_error = (pdf_key, f"PDF conversion failed: {e}")
+    return st.session_state.get(pdf_key)
+
+@st.fragment(run_every=0.5)
+def pdf_build_status(pdf_key: str):
+    # Polls the build without blocking the script, so the page renders meanwhile.
+    if isinstance(_settle_pdf_job(pdf_key), Future):
+        st.status("Building PDF...", state="running")
+    else:
+        # Finished or failed: one full rerun swaps this poller for the result.
+        st.rerun()
+
+# Fragments: their own buttons rerun only the panel, not the whole script.
+@st.fragment
+def draft_panel(state: Dict, groq_key: str, model: str, temperature: float):
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Ideas / Outline")
+        with st.expander("Ideas (LLM)", expanded=False):
+            st.markdown(str(state["ideas"]))
+        with st.expander("Angles (LLM)", expanded=False):
+            st.markdown(str(state.get("angles", "")))
+        st.markdown("#### Outline")
+        st.markdown(str(state["outline"]))
+
+    with col2:
+        st.subheader("Draft")
+        st.markdown(str(state["draft"]))
+
+    st.subheader("Supervisor notes")
+    st.markdown(str(state["supervisor_notes"]))
+
+    c1, c2, c3 = st.columns([1,1,2])
+    with c1:
+        if st.button("Revise draft"):
+            try:
+                llm = make_llm(groq_key, model=model, temperature=temperature)
+            except Exception as e:
+                st.error(str(e))
+                st.stop()
+            with st.spinner(f"Revising ({REVISION_CANDIDATES} candidates)..."):
+                new_draft, new_notes = run_async(revise(llm, state))
+                state["draft"] = CompressedStr(new_draft)
+                state["supervisor_notes"] = CompressedStr(new_notes)
+                state["revisions"] += 1
+                save_state(state)
+            # Only this panel shows the draft and notes, so skip the full script.
+            st.rerun(scope="fragment")
+
+    with c2:
+        if st.button("Approve & Finalize"):
+            try:
+                llm = make_llm(groq_key, model=model, temperature=temperature)
+            except Exception as e:
+                st.error(str(e))
+                st.stop()
+            with st.spinner("Finalizing..."):
+                # JSON is only useful once complete: buffer the stream, show progress.
+                progress = st.empty()
+                chunks, received = [], 0
+                for chunk in cached_stream(llm, finalizer_messages(str(state["draft"]),
+                                                                   str(state["supervisor_notes"]),
+                                                                   state["tone"])):
+                    chunks.append(chunk)
+                    received += len(chunk)
+                    progress.caption(f"{received} characters received")
+                pack = parse_final_pack("".join(chunks))
+                pack["body_md"] = CompressedStr(str(pack["body_md"]))
+                state["final"] = pack
+                save_state(state)
+            # The final package renders outside this fragment: rerun the whole app.
+            st.rerun()
+
+@st.fragment
+def final_panel(final: Dict):
+    st.success("Final package ready!")
+    st.markdown(f"### Title\n{final.get('title','')}")
+    st.markdown(f"**Meta:** {final.get('meta','')}  \n**Slug:** `{final.get('slug','')}`  \n**Tags:** {', '.join(final.get('tags', []))}")
+    st.markdown("### Final Markdown")
+    st.markdown(str(final.get("body_md","")))
+
 
 # -------------------------------
 # Streamlit UI
@@ -167,13 +378,28 @@ with st.sidebar:
     st.markdown("---")
     st.subheader("Markdown → PDF")
     md_upload = st.file_uploader("Upload .md to convert", type=["md", "markdown"])
+    # Keyed on the current upload, so a new file never serves an older file's PDF.
+    pdf_key = f"pdf_job_{hash(md_upload.getvalue())}" if md_upload is not None else None
     if st.button("Convert uploaded Markdown to PDF"):
-        if md_upload is not None:
-            md_text = md_upload.read().decode("utf-8", errors="ignore")
-            pdf_bytes = markdown_to_basic_pdf_bytes(md_text)
-            st.download_button("Download PDF", pdf_bytes, file_name="converted.pdf", mime="application/pdf")
+        if pdf_key is not None:
+            st.session_state.pop("pdf_error", None)
+            if pdf_key not in st.session_state:
+                # Keep only the latest conversion around.
+                for old in [k for k in st.session_state if str(k).startswith("pdf_job_")]:
+                    del st.session_state[old]
+                md_text = md_upload.getvalue().decode("utf-8", errors="ignore")
+                st.session_state[pdf_key] = _pdf_pool().submit(markdown_to_basic_pdf_bytes, md_text)
         else:
             st.warning("Please upload a markdown file first.")
+    if pdf_key is not None:
+        pdf_job = _settle_pdf_job(pdf_key)
+        pdf_error = st.session_state.get("pdf_error")
+        if pdf_error and pdf_error[0] == pdf_key:
+            st.error(pdf_error[1])
+        if isinstance(pdf_job, Future):
+            pdf_build_status(pdf_key)
+        elif pdf_job is not None:
+            st.download_button("Download PDF", pdf_job, file_name="converted.pdf", mime="application/pdf")
 
 st.title("LangGraph Blog Writing Agent — Blogger")
 
@@ -187,7 +413,7 @@ with st.form("profile_form"):
     submitted = st.form_submit_button("Generate Draft")
 
 if "state" not in st.session_state:
-    st.session_state.state = {}
+    st.session_state.state = load_state()
 
 if submitted:
     try:
@@ -196,15 +422,23 @@ if submitted:
         st.error(str(e))
         st.stop()
 
+    # An explicit Generate click always asks for a fresh draft: at temperature > 0
+    # re-clicking is how the user gets a different one, so skip cached responses.
     with st.spinner("Generating ideas & outline..."):
-        idea_pack = ideas_researcher(llm, topic, audience, tone)
-        outline = outliner(llm, idea_pack["ideas"])
+        idea_pack, angles, outline = run_async(ideas_and_outline(llm, topic, audience, tone, use_cache=False))
 
-    with st.spinner("Writing draft..."):
-        draft = writer(llm, topic, audience, tone, int(target_words), outline, instructions)
+    # Draft and review stream in as they're generated; cleared once state is stored.
+    live = st.empty()
+    with live.container():
+        st.subheader("Draft")
+        with st.spinner("Writing draft..."):
+            draft = stream_markdown(cached_stream(llm, writer_messages(
+                topic, audience, tone, int(target_words), outline, instructions), use_cache=False))
 
-    with st.spinner("Supervisor review..."):
-        notes = supervisor(llm, draft)
+        st.subheader("Supervisor notes")
+        with st.spinner("Supervisor review..."):
+            notes = stream_markdown(cached_stream(llm, supervisor_messages(draft), use_cache=False))
+    live.empty()
 
     st.session_state.state = {
         "topic": topic,
@@ -212,70 +446,18 @@ if submitted:
         "tone": tone,
         "target_words": int(target_words),
         "instructions": instructions,
-        "ideas": idea_pack["ideas"],
-        "outline": outline,
-        "draft": draft,
-        "supervisor_notes": notes,
+        "ideas": CompressedStr(idea_pack["ideas"]),
+        "angles": CompressedStr(angles),
+        "outline": CompressedStr(outline),
+        "draft": CompressedStr(draft),
+        "supervisor_notes": CompressedStr(notes),
         "final": None,
         "revisions": 0,
     }
+    save_state(st.session_state.state)
 
 if st.session_state.state.get("draft"):
-    col1, col2 = st.columns(2)
-    with col1:
-        st.subheader("Ideas / Outline")
-        with st.expander("Ideas (LLM)", expanded=False):
-            st.markdown(st.session_state.state["ideas"])
-        st.markdown("#### Outline")
-        st.markdown(st.session_state.state["outline"])
-
-    with col2:
-        st.subheader("Draft")
-        st.markdown(st.session_state.state["draft"])
-
-    st.subheader("Supervisor notes")
-    st.markdown(st.session_state.state["supervisor_notes"])
-
-    c1, c2, c3 = st.columns([1,1,2])
-    with c1:
-        if st.button("Revise draft"):
-            try:
-                llm = make_llm(groq_key, model=model, temperature=temperature)
-            except Exception as e:
-                st.error(str(e))
-                st.stop()
-            with st.spinner("Revising..."):
-                extra = st.session_state.state["instructions"] + "\n\nRevise based on these notes:\n" + st.session_state.state["supervisor_notes"]
-                new_draft = writer(llm,
-                                   st.session_state.state["topic"],
-                                   st.session_state.state["audience"],
-                                   st.session_state.state["tone"],
-                                   int(st.session_state.state["target_words"]),
-                                   st.session_state.state["outline"],
-                                   extra)
-                st.session_state.state["draft"] = new_draft
-                st.session_state.state["revisions"] += 1
-                st.rerun()
-
-    with c2:
-        if st.button("Approve & Finalize"):
-            try:
-                llm = make_llm(groq_key, model=model, temperature=temperature)
-            except Exception as e:
-                st.error(str(e))
-                st.stop()
-            with st.spinner("Finalizing..."):
-                pack = finalizer(llm,
-                                 st.session_state.state["draft"],
-                                 st.session_state.state["supervisor_notes"],
-                                 st.session_state.state["tone"])
-                st.session_state.state["final"] = pack
-            st.rerun()
+    draft_panel(st.session_state.state, groq_key, model, temperature)
 
 if st.session_state.state.get("final"):
-    final = st.session_state.state["final"]
-    st.success("Final package ready!")
-    st.markdown(f"### Title\n{final.get('title','')}")
-    st.markdown(f"**Meta:** {final.get('meta','')}  \n**Slug:** `{final.get('slug','')}`  \n**Tags:** {', '.join(final.get('tags', []))}")
-    st.markdown("### Final Markdown")
-    st.markdown(final.get("body_md",""))
+    final_panel(st.session_state.state["final"])
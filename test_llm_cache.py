@@ -0,0 +1,52 @@
+import asyncio
+from types import SimpleNamespace
+
+import llm_cache
+
+
+class FakeLLM:
+    model_name = "fake-model"
+    temperature = 0.7
+
+    def __init__(self):
+        self.calls = 0
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        return SimpleNamespace(content=f"reply {self.calls}")
+
+    def stream(self, messages):
+        self.calls += 1
+        yield SimpleNamespace(content=f"reply {self.calls}")
+
+
+def _messages(text):
+    return [SimpleNamespace(type="human", content=text)]
+
+
+def test_ainvoke_serves_repeat_calls_from_cache():
+    llm = FakeLLM()
+    msgs = _messages("ainvoke repeat")
+    first = asyncio.run(llm_cache.cached_ainvoke(llm, msgs))
+    assert asyncio.run(llm_cache.cached_ainvoke(llm, msgs)) == first
+    assert llm.calls == 1
+
+
+def test_use_cache_false_always_calls_the_llm():
+    llm = FakeLLM()
+    msgs = _messages("ainvoke refresh")
+    first = asyncio.run(llm_cache.cached_ainvoke(llm, msgs))
+    fresh = asyncio.run(llm_cache.cached_ainvoke(llm, msgs, use_cache=False))
+    assert fresh != first
+    # The fresh reply replaces the cached one.
+    assert asyncio.run(llm_cache.cached_ainvoke(llm, msgs)) == fresh
+    assert llm.calls == 2
+
+
+def test_stream_use_cache_false_skips_lookup():
+    llm = FakeLLM()
+    msgs = _messages("stream refresh")
+    first = "".join(llm_cache.cached_stream(llm, msgs))
+    assert "".join(llm_cache.cached_stream(llm, msgs)) == first
+    assert "".join(llm_cache.cached_stream(llm, msgs, use_cache=False)) != first
+    assert llm.calls == 2
@@ -0,0 +1,35 @@
+import pytest
+
+from review import best_candidate, is_approved
+
+
+@pytest.mark.parametrize("notes", [
+    "APPROVED",
+    "Approved.",
+    "**APPROVED**",
+    "APPROVED - the draft reads well.",
+    "Looks good overall.\n\nAPPROVED",
+])
+def test_sign_off_is_approved(notes):
+    assert is_approved(notes)
+
+
+@pytest.mark.parametrize("notes", [
+    "Not approved yet: the intro is weak.",
+    "UNAPPROVED",
+    "This can't be approved until the conclusion is rewritten.",
+    "1. Tighten the intro.\n2. Nothing here is approved as-is.",
+])
+def test_rejection_is_not_approved(notes):
+    assert not is_approved(notes)
+
+
+def test_not_approved_note_does_not_beat_a_cleaner_candidate():
+    notes = [
+        "Not approved yet.",
+        "1. Shorten the TL;DR.\n2. Add a concrete example in section 2.",
+    ]
+    # Neither is approved, so the shorter notes win...
+    assert best_candidate(notes) == 0
+    # ...but a genuine sign-off beats both.
+    assert best_candidate(notes + ["Strong draft overall, no blockers.\nAPPROVED"]) == 2
@@ -0,0 +1,49 @@
+import diskcache
+import pytest
+
+import session_store
+
+
+class FakeSessionState(dict):
+    __getattr__ = dict.__getitem__
+    __setattr__ = dict.__setitem__
+
+
+@pytest.fixture
+def browser(monkeypatch, tmp_path):
+    cache = diskcache.Cache(str(tmp_path))
+    monkeypatch.setattr(session_store, "_cache", lambda: cache)
+    url = {}
+    monkeypatch.setattr(session_store.st, "query_params", url)
+
+    def reload():
+        # A reload keeps the URL but starts a new, empty session_state.
+        monkeypatch.setattr(session_store.st, "session_state", FakeSessionState())
+        return session_store.load_state()
+
+    yield url, reload
+    cache.close()
+
+
+def test_state_survives_repeated_reloads(browser):
+    url, reload = browser
+    assert reload() == {}
+    session_store.save_state({"topic": "Rust in production"})
+
+    assert reload() == {"topic": "Rust in production"}
+    # No edit between the reloads: the draft must still be there.
+    assert reload() == {"topic": "Rust in production"}
+
+
+def test_each_session_saves_under_its_own_id(browser):
+    url, reload = browser
+    reload()
+    session_store.save_state({"topic": "first"})
+    shared = url["sid"]
+
+    reload()
+    assert url["sid"] != shared
+    session_store.save_state({"topic": "forked"})
+    # The original link still loads the original draft.
+    url["sid"] = shared
+    assert reload() == {"topic": "first"}
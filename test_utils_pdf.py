@@ -0,0 +1,36 @@
+import pytest
+
+import utils_pdf
+
+# Each renders to a single page, so markdown_to_basic_pdf_bytes takes the fast path.
+SAMPLES = {
+    "empty": "",
+    "short": "# Title\n\nHello (world) \\ back\n\n- item one\n- item two\n",
+    "unicode": "> quote “smart” — dash… café ✓ → 😀\r\nwindows line",
+    "long_word": "Superlongtoken" + "x" * 300,
+    "code": "```\ncode   line\twith tab\n```\n\n## Heading\n\n* bullet (1)\n* bullet (2)\n",
+}
+
+
+@pytest.mark.parametrize("name", sorted(SAMPLES))
+def test_one_page_fast_path_matches_general_writer(name, monkeypatch):
+    md = SAMPLES[name]
+    fast = utils_pdf.markdown_to_basic_pdf_bytes(md)
+    monkeypatch.setattr(utils_pdf, "ONE_PAGE_FAST_PATH", False)
+    general = utils_pdf.markdown_to_basic_pdf_bytes(md)
+    assert b"/Count 1 >>" in general
+    assert fast == general
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("## Heading", "Heading"),
+    ("#hashtag trending", "#hashtag trending"),
+    ("> > nested quote", "nested quote"),
+    (">> nested quote", "nested quote"),
+    ("> - quoted bullet", "quoted bullet"),
+    ("  * bullet", "bullet"),
+    ("---", "---"),
+    ("-5 degrees", "-5 degrees"),
+])
+def test_plain_line_strips_markers(raw, expected):
+    assert utils_pdf._plain_line(raw) == expected
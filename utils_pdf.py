@@ -1,19 +1,114 @@
+import io
+import re
+import zlib
+
+
+# Typographic characters Helvetica/Type1 can't show, mapped to ASCII look-alikes.
+_PDF_ASCII = str.maketrans({
+    "“": '"', "”": '"', "„": '"', "‟": '"',
+    "‘": "'", "’": "'", "‚": "'", "‛": "'",
+    "–": "-", "—": "-", "−": "-",
+    "•": "-", "·": "-", "►": ">", "→": "->", "←": "<-", "✓": "[ok]",
+    "…": "...", " ": " ", " ": " ", " ": " ", " ": " ",
+})
+
+# Helvetica advance widths (1000-unit em) for codes 0-127 under StandardEncoding,
+# from the Adobe Core14 AFM. Control codes have no glyph. Text reaching the wrapper
+# has been through _sanitize_for_pdf, so it is always ASCII.
+HELVETICA_WIDTHS = [
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    278, 278, 355, 556, 556, 889, 667, 222, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    222, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584, 0,
+]
+
+# Leading markdown block markers, possibly nested ("> > ", "> - "): headings ("## "),
+# quotes (">") and list bullets ("- ", "* "). Headings and bullets need the space, so
+# "#hashtag" and a "---" rule are left alone.
+_MD_PREFIX = re.compile(r"^\s*(?:(?:#{1,6}|[-*])\s+|>+\s*)*")
+
+# PDF string-literal escapes for text inside ( ... ) Tj.
+_PDF_ESC = str.maketrans({"\\": "\\\\", "(": "\\(", ")": "\\)"})
+
+# One-page documents skip the general writer (see _one_page_pdf); tests turn this
+# off to compare both paths.
+ONE_PAGE_FAST_PATH = True
+
+_PDF_HEADER = b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n"
+_CATALOG_OBJ = b"<< /Type /Catalog /Pages 2 0 R >>"
+_FONT_OBJ = b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Name /F1 >>"
+
+
+def _one_page_template():
+    # Header, objects 1-3 and their xref entries never change for a one-page
+    # document, and object 4 (the content stream) always starts right after them.
+    head = _PDF_HEADER
+    xref = [b"xref\n0 6\n0000000000 65535 f \n"]
+    for i, obj in enumerate((_CATALOG_OBJ, b"<< /Type /Pages /Kids [5 0 R] /Count 1 >>", _FONT_OBJ), start=1):
+        xref.append(b"%010d 00000 n \n" % len(head))
+        head += b"%d 0 obj\n" % i + obj + b"endobj\n"
+    xref.append(b"%010d 00000 n \n" % len(head))
+    return head, b"".join(xref)
+
+_ONE_PAGE_HEAD, _ONE_PAGE_XREF = _one_page_template()
+
+def _one_page_pdf(content_obj: bytes, page_obj: bytes) -> bytes:
+    """Single-page fast path: only objects 4 and 5 vary, so offsets are sums of known lengths."""
+    content = b"4 0 obj\n" + content_obj + b"endobj\n"
+    page = b"5 0 obj\n" + page_obj + b"endobj\n"
+    page_offset = len(_ONE_PAGE_HEAD) + len(content)
+    xref_start = page_offset + len(page)
+    return b"".join((
+        _ONE_PAGE_HEAD, content, page, _ONE_PAGE_XREF,
+        b"%010d 00000 n \n" % page_offset,
+        b"trailer\n<< /Size 6 /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF" % xref_start,
+    ))
+
 
 def _sanitize_for_pdf(s: str) -> str:
-    replacements = {
-        "“": '"', "”": '"', "„": '"', "‟": '"',
-        "‘": "'", "’": "'", "‚": "'", "‛": "'",
-        "–": "-", "—": "-", "−": "-",
-        "•": "-", "·": "-", "►": ">", "→": "->", "←": "<-", "✓": "[ok]",
-        "…": "...", " ": " ", " ": " ", " ": " ", " ": " ",
-    }
-    for k, v in replacements.items():
-        s = s.replace(k, v)
-    s = ''.join(ch if ord(ch) < 128 else '?' for ch in s)
-    return s
+    # One C-level translate pass, then any remaining non-ASCII becomes '?'.
+    return s.translate(_PDF_ASCII).encode("ascii", "replace").decode("ascii")
+
+def _plain_line(raw: str) -> str:
+    # Drop the leading heading/quote/bullet markers, then map to PDF-safe ASCII.
+    return _sanitize_for_pdf(_MD_PREFIX.sub("", raw, 1))
+
+def _text_width(word: str) -> int:
+    return sum(map(HELVETICA_WIDTHS.__getitem__, word.encode("ascii")))
+
+def _wrap_to_width(text: str, max_width: float, font_size: int) -> list:
+    """Greedy word wrap by measured Helvetica width; words wider than a line are split."""
+    limit = max_width * 1000 / font_size
+    space = HELVETICA_WIDTHS[ord(" ")]
+    lines, cur, cur_w = [], [], 0
+    for word in text.split():
+        w = _text_width(word)
+        if cur and cur_w + space + w <= limit:
+            cur.append(word)
+            cur_w += space + w
+            continue
+        if cur:
+            lines.append(" ".join(cur))
+        if w <= limit:
+            cur, cur_w = [word], w
+            continue
+        start, piece_w = 0, 0
+        for i, code in enumerate(word.encode("ascii")):
+            cw = HELVETICA_WIDTHS[code]
+            if piece_w + cw > limit and i > start:
+                lines.append(word[start:i])
+                start, piece_w = i, 0
+            piece_w += cw
+        cur, cur_w = [word[start:]], piece_w
+    if cur:
+        lines.append(" ".join(cur))
+    return lines
 
 def markdown_to_basic_pdf_bytes(md_text: str) -> bytes:
-    import textwrap
     plain = md_text.replace("\r\n", "\n")
     for ch in ["`"]:
         plain = plain.replace(ch, "")
@@ -23,19 +118,17 @@ def markdown_to_basic_pdf_bytes(md_text: str) -> bytes:
     margin = 54
     font_size = 12
     leading = 16
-    max_chars = 90
     usable_lines = int((height - 2*margin) // leading) - 1
     if usable_lines < 10:
         usable_lines = 10
 
     lines = []
     for raw in lines_in:
-        stripped = raw.lstrip("# ").lstrip("* ").lstrip("- ").lstrip("> ")
-        stripped = _sanitize_for_pdf(stripped)
+        stripped = _plain_line(raw)
         if not stripped:
             lines.append("")
             continue
-        wrapped = textwrap.wrap(stripped, width=max_chars) or [""]
+        wrapped = _wrap_to_width(stripped, width - 2*margin, font_size) or [""]
         lines.extend(wrapped)
 
     pages = [lines[i:i+usable_lines] for i in range(0, len(lines), usable_lines)] or [[]]
@@ -43,66 +136,61 @@ def markdown_to_basic_pdf_bytes(md_text: str) -> bytes:
     def make_page(page_lines):
         start_x = margin
         start_y = height - margin
-        content_lines = [
-            "BT",
-            f"/F1 {font_size} Tf",
-            f"{start_x} {start_y} Td",
-            f"{leading} TL",
-        ]
-        first = True
-        for line in page_lines:
-            esc = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
-            if not first:
-                content_lines.append("T*")
-            first = False
-            content_lines.append(f"({esc}) Tj")
-        content_lines.append("ET")
-        return "\n".join(content_lines).encode("ascii", "ignore")
-
-    objects = []
-    kids = []
-    obj_id = 1
-
-    def add_object(obj_bytes):
-        nonlocal obj_id
-        objects.append(obj_bytes if isinstance(obj_bytes, (bytes, bytearray)) else obj_bytes.encode("utf-8"))
-        obj_id += 1
-        return obj_id-1
-
-    catalog_id = add_object(b"<< /Type /Catalog /Pages 2 0 R >>")
-    pages_id = add_object(b"<< /Type /Pages /Kids [] /Count 0 >>")
-    font_id = add_object(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Name /F1 >>")
-
-    page_ids = []
-    for pg in pages:
-        stream = make_page(pg)
-        content_obj = b"<< /Length " + str(len(stream)).encode("ascii") + b" >>\nstream\n" + stream + b"\nendstream\n"
-        content_id = add_object(content_obj)
-        page_dict = f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {width} {height}] /Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {content_id} 0 R >>"
-        page_id = add_object(page_dict)
-        page_ids.append(page_id)
+        buf = io.BytesIO()
+        buf.write(f"BT\n/F1 {font_size} Tf\n{start_x} {start_y} Td\n{leading} TL\n".encode("ascii"))
+        if page_lines:
+            # Lines never contain "\n", so escape/encode the page in one go and
+            # turn each line break into the Tj/T* operators between lines.
+            text = "\n".join(page_lines).translate(_PDF_ESC).encode("ascii", "ignore")
+            buf.write(b"(")
+            buf.write(text.replace(b"\n", b") Tj\nT*\n("))
+            buf.write(b") Tj\n")
+        buf.write(b"ET")
+        return buf.getvalue()
 
-    offsets = []
-    pdf = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
-    for i, obj in enumerate(objects, start=1):
-        offsets.append(len(pdf))
-        pdf += f"{i} 0 obj\n".encode("ascii") + obj + b"endobj\n"
+    # Object ids are fixed by the layout, so /Kids is known before anything is
+    # written: 1 catalog, 2 pages, 3 font, then a (content, page) pair per page.
+    font_id = 3
+    page_ids = [5 + 2*i for i in range(len(pages))]
     kids_str = " ".join(f"{pid} 0 R" for pid in page_ids)
-    pages_obj = f"<< /Type /Pages /Kids [{kids_str}] /Count {len(page_ids)} >>".encode("ascii")
-    objects2 = [b"<< /Type /Catalog /Pages 2 0 R >>", pages_obj] + objects[2:]
+
+    def content_obj(stream):
+        comp = zlib.compress(stream, 6)
+        return f"<< /Length {len(comp)} /Filter /FlateDecode >>\nstream\n".encode("ascii") + comp + b"\nendstream\n"
+
+    def page_obj(content_id):
+        return f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {width} {height}] /Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {content_id} 0 R >>".encode("utf-8")
+
+    if ONE_PAGE_FAST_PATH and len(pages) == 1:
+        return _one_page_pdf(content_obj(make_page(pages[0])), page_obj(4))
+
+    buf = io.BytesIO()
+    buf.write(_PDF_HEADER)
     offsets = []
-    pdf = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
-    for i, obj in enumerate(objects2, start=1):
-        offsets.append(len(pdf))
-        pdf += f"{i} 0 obj\n".encode("ascii") + obj + b"endobj\n"
-    xref_start = len(pdf)
-    pdf += f"xref\n0 {len(objects2)+1}\n".encode("ascii")
-    pdf += b"0000000000 65535 f \n"
+
+    def add_object(obj_bytes):
+        offsets.append(buf.tell())
+        buf.write(f"{len(offsets)} 0 obj\n".encode("ascii"))
+        buf.write(obj_bytes)
+        buf.write(b"endobj\n")
+        return len(offsets)
+
+    add_object(_CATALOG_OBJ)
+    add_object(f"<< /Type /Pages /Kids [{kids_str}] /Count {len(page_ids)} >>".encode("ascii"))
+    add_object(_FONT_OBJ)
+
+    for page_lines in pages:
+        content_id = add_object(content_obj(make_page(page_lines)))
+        add_object(page_obj(content_id))
+
+    xref_start = buf.tell()
+    buf.write(f"xref\n0 {len(offsets)+1}\n".encode("ascii"))
+    buf.write(b"0000000000 65535 f \n")
     for off in offsets:
-        pdf += f"{off:010d} 00000 n \n".encode("ascii")
-    pdf += b"trailer\n"
-    pdf += f"<< /Size {len(objects2)+1} /Root 1 0 R >>\n".encode("ascii")
-    pdf += b"startxref\n"
-    pdf += f"{xref_start}\n".encode("ascii")
-    pdf += b"%%EOF"
-    return bytes(pdf)
+        buf.write(f"{off:010d} 00000 n \n".encode("ascii"))
+    buf.write(b"trailer\n")
+    buf.write(f"<< /Size {len(offsets)+1} /Root 1 0 R >>\n".encode("ascii"))
+    buf.write(b"startxref\n")
+    buf.write(f"{xref_start}\n".encode("ascii"))
+    buf.write(b"%%EOF")
+    return buf.getvalue()